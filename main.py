@@ -1,26 +1,24 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import glob
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import threading
 import warnings
 import time
-from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 warnings.filterwarnings('ignore')
 
-# Set page config with chess theme
-st.set_page_config(
-    page_title="♛ Lichess Chess Analytics Pro",
-    page_icon="♟️",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+# Plotting and engine libraries are imported inside the functions that use them
+# so the dashboard starts without paying for modules that may never render.
 
 # Custom CSS for chess.com inspired green and black theme
-st.markdown("""
+PAGE_CSS = """
 <style>
     @import url('https://fonts.googleapis.com/css2?family=Orbitron:wght@400;700;900&family=Inter:wght@300;400;500;600;700&display=swap');
     
@@ -353,48 +351,787 @@ st.markdown("""
         color: #ffffff;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+def apply_page_theme():
+    """Set page config and inject the chess theme CSS"""
+    st.set_page_config(
+        page_title="♛ Lichess Chess Analytics Pro",
+        page_icon="♟️",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    st.markdown(PAGE_CSS, unsafe_allow_html=True)
 
 # Helper functions
-@st.cache_data
-def load_and_process_data(uploaded_file):
-    """Load and process the chess dataset with enhanced error handling"""
+UTC_DATE_FORMAT = '%Y.%m.%d'
+UTC_TIMESTAMP_FORMAT = '%Y.%m.%d %H:%M:%S'
+WEEKDAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+DAY_PARTS = ['Night (00-06)', 'Morning (06-12)', 'Afternoon (12-18)', 'Evening (18-24)']
+
+DATA_ROOT_ENV = 'CHESS_DATA_ROOT'
+GAMES_FILE_PATTERN = '*.csv'
+LOAD_WORKERS = 8
+
+def configured_data_root():
+    """Server directory the operator allows loading from (CHESS_DATA_ROOT), or None when unset"""
+    root = os.environ.get(DATA_ROOT_ENV)
+    return os.path.realpath(root) if root else None
+
+def resolve_server_sources(pattern, root):
+    """Expand a directory or glob under root into (name, path, modified time) sources
+
+    Patterns are taken relative to root. A pattern that points outside root is refused before
+    globbing, and a match that leaves it through a symlink is dropped.
+    """
+    pattern = os.path.normpath(os.path.join(root, pattern.strip()))
+    if os.path.commonpath([root, pattern]) != root:
+        return []
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, GAMES_FILE_PATTERN)
+    paths = sorted(
+        path for path in map(os.path.realpath, glob.glob(pattern, recursive=True))
+        if os.path.isfile(path) and os.path.commonpath([root, path]) == root
+    )
+    return [(os.path.relpath(path, root), path, os.path.getmtime(path)) for path in dict.fromkeys(paths)]
+
+REQUIRED_COLUMNS = [
+    'event', 'white', 'black', 'result', 'utcdate', 'utctime', 'whiteelo', 'blackelo',
+    'variant', 'timecontrol', 'eco', 'termination', 'moves'
+]
+RESULT_TOKENS = ['1-0', '0-1', '1/2-1/2']
+MISSING_ELO_TOKENS = ['?', '']
+ELO_RANGE = (100, 4000)
+EARLIEST_GAME_DATE = '2010-01-01'
+PLY_TOKEN_PATTERN = r'(?<!\S)(?!\d+\.+(?:\s|$))(?!(?:1-0|0-1|1/2-1/2|\*)(?:\s|$))\S+'
+
+def read_games_file(source):
+    """Read one games CSV, normalize its column names and tag rows with the source name
+
+    Returns the frame, any lines the parser could not split into the header's fields, and the
+    read error for a file that could not be parsed at all, in which case the frame is None.
+    """
+    name, data, _ = source
+    bad_lines = []
     try:
-        df = pd.read_csv(uploaded_file)
-        
-        # Clean column names
-        df.columns = df.columns.str.strip().str.lower().str.replace(' ', '_')
-        
-        # Parse result column into winner
-        def get_winner(result):
-            if result == '1-0':
-                return 'White'
-            elif result == '0-1':
-                return 'Black'
+        try:
+            frame = pd.read_csv(data, encoding_errors='replace')
+        except pd.errors.ParserError:
+            # Re-read with the Python parser, which hands malformed lines back instead of failing
+            if hasattr(data, 'seek'):
+                data.seek(0)
+            frame = pd.read_csv(
+                data, engine='python', encoding_errors='replace',
+                on_bad_lines=lambda fields: bad_lines.append(','.join(fields))
+            )
+    except (OSError, ValueError) as e:
+        # Empty, unreadable or unparseable files are quarantined alone instead of failing the load
+        return None, bad_lines, str(e) or type(e).__name__
+    frame.columns = frame.columns.str.strip().str.lower().str.replace(' ', '_')
+    frame['source'] = name
+    return frame, bad_lines, None
+
+def validate_games(df, white_elo, black_elo, utcdate):
+    """Run vectorized row checks and return each row's quarantine reasons ('' when valid)"""
+    result = df['result'].astype(str).str.strip()
+    moves = df['moves'].fillna('').astype(str).str.strip()
+    last_token = moves.str.rsplit(n=1).str[-1].fillna('')
+    today = pd.Timestamp.now(tz='UTC').tz_localize(None).normalize()
+    
+    def bad_elo(raw, parsed):
+        missing = raw.isna() | raw.astype(str).str.strip().isin(MISSING_ELO_TOKENS)
+        return ~missing & (parsed.isna() | ~parsed.between(*ELO_RANGE))
+    
+    checks = [
+        (~result.isin(RESULT_TOKENS), "Unknown result token"),
+        (bad_elo(df['whiteelo'], white_elo), "White Elo not a rating"),
+        (bad_elo(df['blackelo'], black_elo), "Black Elo not a rating"),
+        (utcdate.isna(), "Unreadable UTC date"),
+        ((utcdate < pd.Timestamp(EARLIEST_GAME_DATE)) | (utcdate > today + pd.Timedelta(days=1)),
+         "UTC date out of range"),
+        (last_token.isin(MOVETEXT_RESULTS) & (last_token != result), "Movetext result differs from Result"),
+        (moves.str.contains('#', regex=False) & (result == '1/2-1/2'), "Checkmate recorded as a draw")
+    ]
+    
+    reasons = np.full(len(df), '', dtype=object)
+    for mask, reason in checks:
+        mask = mask.to_numpy()
+        reasons[mask] = reasons[mask] + reason + '; '
+    return pd.Series(reasons, index=df.index).str.rstrip('; ')
+
+@st.cache_data
+def load_and_process_data(sources):
+    """Load, validate and process the chess dataset, quarantining rows that fail validation
+
+    Returns (games, quarantine); quarantine keeps the raw values plus a quarantine_reason column.
+    """
+    # Parse every file concurrently; the CSV parser releases the GIL while tokenizing
+    with ThreadPoolExecutor(max_workers=min(LOAD_WORKERS, len(sources))) as pool:
+        results = list(pool.map(read_games_file, sources))
+    
+    quarantined = []
+    frames = []
+    for (name, _, _), (frame, bad_lines, error) in zip(sources, results):
+        if error:
+            quarantined.append(pd.DataFrame({
+                'source': [name], 'quarantine_reason': [f"Unreadable file: {error}"]
+            }))
+            continue
+        if bad_lines:
+            quarantined.append(pd.DataFrame({
+                'source': name, 'raw_line': bad_lines, 'quarantine_reason': "Malformed CSV line"
+            }))
+        missing = [col for col in REQUIRED_COLUMNS if col not in frame.columns]
+        if missing:
+            # Without the core columns nothing in the file can be analyzed
+            quarantined.append(pd.DataFrame({
+                'source': [name],
+                'quarantine_reason': [f"File missing required columns: {', '.join(missing)}"]
+            }))
+        else:
+            frames.append(frame)
+    
+    if frames:
+        # Reconcile schemas as the union of columns
+        df = pd.concat(frames, ignore_index=True, sort=False)
+    else:
+        df = pd.DataFrame(columns=REQUIRED_COLUMNS + ['source'])
+    
+    # Parse with fixed formats, then set aside rows that fail validation
+    white_elo = pd.to_numeric(df['whiteelo'], errors='coerce')
+    black_elo = pd.to_numeric(df['blackelo'], errors='coerce')
+    utcdate = pd.to_datetime(df['utcdate'], format=UTC_DATE_FORMAT, errors='coerce')
+    reasons = validate_games(df, white_elo, black_elo, utcdate)
+    
+    invalid = (reasons != '').to_numpy()
+    if invalid.any():
+        quarantined.append(df[invalid].assign(quarantine_reason=reasons[invalid]))
+    quarantine = (
+        pd.concat(quarantined, ignore_index=True, sort=False) if quarantined
+        else pd.DataFrame(columns=['source', 'quarantine_reason'])
+    )
+    
+    valid = ~invalid
+    if 'gameid' in df.columns:
+        # Drop games seen in an earlier file, keeping the first copy that passed validation
+        valid_ids = df['gameid'].where(valid)
+        valid &= ~(valid_ids.notna() & valid_ids.duplicated(keep='first')).to_numpy()
+    df = df[valid].reset_index(drop=True)
+    white_elo = white_elo[valid].reset_index(drop=True)
+    black_elo = black_elo[valid].reset_index(drop=True)
+    utcdate = utcdate[valid].reset_index(drop=True)
+    
+    # Parse result column into winner
+    df['winner'] = df['result'].str.strip().map({'1-0': 'White', '0-1': 'Black'}).fillna('Draw')
+    
+    # Parse Lichess timestamps with their fixed formats instead of per-row inference
+    utc_timestamp = pd.to_datetime(
+        df['utcdate'].astype(str) + ' ' + df['utctime'].astype(str),
+        format=UTC_TIMESTAMP_FORMAT, errors='coerce'
+    )
+    df['utcdate'] = utcdate
+    df['utc_timestamp'] = utc_timestamp
+    
+    # Compact time-of-day features, -1 where the timestamp is missing
+    has_time = utc_timestamp.notna().to_numpy()
+    hour = np.full(len(df), -1, dtype=np.int8)
+    weekday = np.full(len(df), -1, dtype=np.int8)
+    hour[has_time] = utc_timestamp.dt.hour.to_numpy()[has_time]
+    weekday[has_time] = utc_timestamp.dt.weekday.to_numpy()[has_time]
+    df['hour'] = hour
+    df['weekday'] = weekday
+    df['day_part'] = np.where(has_time, hour // 6, -1).astype(np.int8)
+    
+    # Elo columns are numeric here; '?' and blank ratings stay missing
+    df['whiteelo'] = white_elo
+    df['blackelo'] = black_elo
+    
+    # Add computed columns
+    df['avg_elo'] = (df['whiteelo'] + df['blackelo']) / 2
+    
+    # Count SAN plies in one regex pass, skipping move numbers and the result token
+    df['plies'] = df['moves'].astype('string').str.count(PLY_TOKEN_PATTERN).fillna(0).astype(np.int16)
+    df['num_moves'] = ((df['plies'] + 1) // 2).astype(np.int16)
+    
+    # Add month column
+    df['month'] = df['utcdate'].dt.to_period('M')
+    
+    return df, quarantine
+
+def show_quarantine_report(quarantine, export_format='CSV'):
+    """Summarize quarantined rows by reason with the rows themselves behind an expander"""
+    reason_counts = quarantine['quarantine_reason'].str.split('; ').explode().value_counts()
+    st.warning(
+        f"⚠️ {len(quarantine):,} row{'s' if len(quarantine) != 1 else ''} quarantined during validation"
+    )
+    with st.expander("🚧 Quarantined Rows"):
+        st.dataframe(
+            reason_counts.rename_axis('reason').reset_index(name='rows'),
+            use_container_width=True, hide_index=True
+        )
+        st.dataframe(quarantine.head(1000), use_container_width=True, hide_index=True)
+        render_export_button(quarantine, "quarantine", export_format, "export_quarantine")
+
+# Time-of-day activity store
+@st.cache_resource(max_entries=4)
+def build_hour_weekday_counts(dataset_key, _df):
+    """Count games per (weekday, hour, outcome) with a single bincount over the int8 features"""
+    valid = (_df['hour'].to_numpy() >= 0)
+    weekday = _df['weekday'].to_numpy()[valid].astype(np.intp)
+    hour = _df['hour'].to_numpy()[valid].astype(np.intp)
+    outcome = pd.Categorical(_df['winner'], categories=OUTCOMES).codes[valid].astype(np.intp)
+    keep = outcome >= 0
+    flat_index = (weekday[keep] * 24 + hour[keep]) * len(OUTCOMES) + outcome[keep]
+    return np.bincount(flat_index, minlength=7 * 24 * len(OUTCOMES)).reshape(7, 24, len(OUTCOMES))
+
+def activity_table(counts, metric='Games'):
+    """Weekday × hour table of game counts or outcome rates from the activity counts"""
+    games = counts.sum(axis=2)
+    if metric == 'Games':
+        values = games.astype(float)
+    else:
+        outcome = OUTCOMES[['White Win %', 'Draw %', 'Black Win %'].index(metric)]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values = np.where(games > 0, counts[..., OUTCOMES.index(outcome)] / games * 100, np.nan)
+    return pd.DataFrame(values, index=WEEKDAYS, columns=[f"{h:02d}:00" for h in range(24)])
+
+# Play session and tilt store
+SESSION_INDEX_CAP = 10
+RESULT_SCORES = {'White': 1.0, 'Draw': 0.5, 'Black': 0.0}
+
+@st.cache_resource(max_entries=4)
+def build_player_game_view(dataset_key, _df):
+    """Explode timestamped games into one row per player, sorted once by player then time
+
+    Returns aligned arrays plus the player and time-control labels they are coded against.
+    The view is shared across reruns of the same dataset_key, so callers must not modify it.
+    """
+    games = _df[_df['utc_timestamp'].notna()]
+    white_score = games['winner'].map(RESULT_SCORES).to_numpy(dtype=float)
+    
+    # Sessions only need players grouped, not ordered by name, so code them without sorting strings
+    player_codes, players = pd.factorize(
+        np.concatenate([games['white'].astype(str).to_numpy(), games['black'].astype(str).to_numpy()])
+    )
+    time_control_codes, time_controls = pd.factorize(games['timecontrol'].astype(str))
+    timestamps = np.tile(games['utc_timestamp'].to_numpy().astype('datetime64[ns]').astype(np.int64), 2)
+    scores = np.concatenate([white_score, 1 - white_score])
+    ratings = np.concatenate([games['whiteelo'].to_numpy(dtype=float), games['blackelo'].to_numpy(dtype=float)])
+    lost_on_time = (np.tile(games['termination'].to_numpy() == 'Time forfeit', 2)) & (scores == 0)
+    
+    # Sort once by player then time; sessions for any gap are shifts and cumulative sums over this
+    order = np.lexsort((timestamps, player_codes))
+    games_per_player = np.bincount(player_codes, minlength=len(players))
+    return {
+        'players': pd.Index(players),
+        'players_by_activity': players[np.argsort(-games_per_player, kind='stable')],
+        'time_controls': pd.Index(time_controls),
+        'player_code': player_codes[order],
+        'timestamp': timestamps[order],
+        'score': scores[order],
+        'rating': ratings[order],
+        'lost_on_time': lost_on_time[order],
+        'time_control': np.tile(time_control_codes, 2)[order]
+    }
+
+def build_player_sessions(view, gap_minutes=30, player=None):
+    """Split the per-player game view into play sessions, for one player or everyone"""
+    rows = slice(None)
+    if player is not None:
+        # Rows are grouped by player code, so a player's games are one contiguous range
+        code = view['players'].get_indexer([player])[0]
+        start, end = np.searchsorted(view['player_code'], [code, code + 1]) if code >= 0 else (0, 0)
+        rows = slice(start, end)
+    player_codes, timestamps = view['player_code'][rows], view['timestamp'][rows]
+    scores, ratings = view['score'][rows], view['rating'][rows]
+    lost_on_time, time_controls = view['lost_on_time'][rows], view['time_control'][rows]
+    
+    same_player = np.r_[False, player_codes[1:] == player_codes[:-1]]
+    gap = np.diff(timestamps, prepend=timestamps[:1])
+    new_session = ~same_player | (gap > gap_minutes * 60 * 10**9)
+    session_id = np.cumsum(new_session) - 1
+    session_start = np.flatnonzero(new_session)
+    game_in_session = np.arange(len(player_codes)) - session_start[session_id] + 1
+    
+    previous_score = np.r_[np.nan, scores[:-1]]
+    previous_score[new_session] = np.nan
+    previous_time_forfeit = np.r_[False, lost_on_time[:-1]] & ~new_session
+    previous_time_control = np.r_[-1, time_controls[:-1]]
+    previous_time_control[new_session] = -1
+    
+    return pd.DataFrame({
+        'player': pd.Categorical.from_codes(player_codes, view['players']),
+        'utc_timestamp': timestamps.astype('datetime64[ns]'),
+        'score': scores,
+        'rating': ratings,
+        'time_control': pd.Categorical.from_codes(time_controls, view['time_controls']),
+        'session_id': session_id,
+        'game_in_session': game_in_session,
+        'rating_delta': ratings - ratings[session_start[session_id]],
+        'previous_score': previous_score,
+        'previous_time_forfeit_loss': previous_time_forfeit,
+        'previous_time_control': pd.Categorical.from_codes(previous_time_control, view['time_controls'])
+    })
+
+def session_index_profile(sessions):
+    """Score rate and rating drift by game number inside a session, capped at SESSION_INDEX_CAP+"""
+    index = np.minimum(sessions['game_in_session'].to_numpy(), SESSION_INDEX_CAP) - 1
+    games = np.bincount(index, minlength=SESSION_INDEX_CAP)
+    score = np.bincount(index, weights=sessions['score'].to_numpy(), minlength=SESSION_INDEX_CAP)
+    rated = ~np.isnan(sessions['rating_delta'].to_numpy())
+    rating_delta = np.bincount(
+        index[rated], weights=sessions['rating_delta'].to_numpy()[rated], minlength=SESSION_INDEX_CAP
+    )
+    rated_games = np.bincount(index[rated], minlength=SESSION_INDEX_CAP)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return pd.DataFrame({
+            'game': [str(i) for i in range(1, SESSION_INDEX_CAP)] + [f"{SESSION_INDEX_CAP}+"],
+            'games': games,
+            'score_pct': np.where(games > 0, score / games * 100, np.nan),
+            'rating_delta': np.where(rated_games > 0, rating_delta / rated_games, np.nan)
+        })
+
+def tilt_profile(sessions, time_control):
+    """Score rate of the next game in a session depending on how the previous one ended"""
+    previous = sessions['previous_score'].to_numpy()
+    conditions = {
+        'Session Start': np.isnan(previous),
+        'After Win': previous == 1,
+        'After Draw': previous == 0.5,
+        'After Loss': previous == 0,
+        f'After Time-Forfeit Loss ({time_control})': (
+            sessions['previous_time_forfeit_loss'].to_numpy()
+            & (sessions['previous_time_control'] == time_control).to_numpy()
+        )
+    }
+    scores = sessions['score'].to_numpy()
+    rows = []
+    for label, mask in conditions.items():
+        games = int(mask.sum())
+        rows.append({
+            'situation': label,
+            'games': games,
+            'score_pct': scores[mask].mean() * 100 if games else np.nan
+        })
+    return pd.DataFrame(rows)
+
+# Opening × rating heatmap store
+ECO_CODES = [f"{family}{number:02d}" for family in "ABCDE" for number in range(100)]
+OUTCOMES = ['White', 'Draw', 'Black']
+ELO_BIN_WIDTH = 50
+ELO_MAX = 3500
+
+@st.cache_resource(max_entries=4)
+def build_opening_rating_cube(dataset_key, _df):
+    """Count games into a (time control, ECO, Elo bin, outcome) array in one vectorized pass
+
+    Only time controls and ECO codes that occur get an axis slot. The cube is shared
+    across reruns of the same dataset_key, so callers must not modify it in place.
+    """
+    time_controls = pd.Categorical(_df['timecontrol'].astype(str))
+    tc_codes = time_controls.codes
+    eco_codes = pd.Categorical(_df['eco'], categories=ECO_CODES).codes
+    outcome_codes = pd.Categorical(_df['winner'], categories=OUTCOMES).codes
+
+    n_bins = ELO_MAX // ELO_BIN_WIDTH
+    avg_elo = _df['avg_elo'].to_numpy(dtype=float)
+    valid = (tc_codes >= 0) & (eco_codes >= 0) & (outcome_codes >= 0) & ~np.isnan(avg_elo)
+    elo_bins = np.clip(avg_elo[valid] // ELO_BIN_WIDTH, 0, n_bins - 1).astype(np.intp)
+    observed_tcs, tc_index = np.unique(tc_codes[valid], return_inverse=True)
+    observed_ecos, eco_index = np.unique(eco_codes[valid], return_inverse=True)
+
+    shape = (len(observed_tcs), len(observed_ecos), n_bins, len(OUTCOMES))
+    flat_index = np.ravel_multi_index((tc_index, eco_index, elo_bins, outcome_codes[valid]), shape)
+    cube = np.bincount(flat_index, minlength=int(np.prod(shape))).astype(np.int32).reshape(shape)
+    return cube, list(time_controls.categories[observed_tcs]), [ECO_CODES[i] for i in observed_ecos]
+
+def slice_opening_heatmap(cube, time_controls, eco_codes, selected_time_controls=None, bin_width=100,
+                          metric='Games', top_n=20):
+    """Reduce the opening cube to an ECO × Elo band table without rescanning the games"""
+    if selected_time_controls:
+        tc_index = [time_controls.index(tc) for tc in selected_time_controls if tc in time_controls]
+        counts = cube[tc_index].sum(axis=0)
+    else:
+        counts = cube.sum(axis=0)
+
+    # Merge fine Elo bins into the requested band width
+    factor = max(1, bin_width // ELO_BIN_WIDTH)
+    n_bins = counts.shape[1]
+    pad = (-n_bins) % factor
+    if pad:
+        counts = np.concatenate([counts, np.zeros((counts.shape[0], pad, counts.shape[2]), counts.dtype)], axis=1)
+    counts = counts.reshape(counts.shape[0], -1, factor, counts.shape[2]).sum(axis=2)
+
+    totals = counts.sum(axis=2)
+    eco_totals = totals.sum(axis=1)
+    eco_rows = np.argsort(-eco_totals, kind='stable')[:top_n]
+    eco_rows = eco_rows[eco_totals[eco_rows] > 0]
+    band_cols = np.flatnonzero(totals[eco_rows].sum(axis=0) > 0)
+
+    if metric == 'Games':
+        values = totals[np.ix_(eco_rows, band_cols)].astype(float)
+    else:
+        outcome = OUTCOMES[['White Win %', 'Draw %', 'Black Win %'].index(metric)]
+        wins = counts[np.ix_(eco_rows, band_cols, [OUTCOMES.index(outcome)])][..., 0]
+        games = totals[np.ix_(eco_rows, band_cols)]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values = np.where(games > 0, wins / games * 100, np.nan)
+
+    band_width = ELO_BIN_WIDTH * factor
+    return pd.DataFrame(
+        values,
+        index=[eco_codes[i] for i in eco_rows],
+        columns=[f"{b * band_width}-{(b + 1) * band_width - 1}" for b in band_cols]
+    )
+
+# Categorical crosstab store
+CROSSTAB_DIMENSIONS = {
+    'timecontrol': 'Time Control',
+    'termination': 'Termination',
+    'winner': 'Outcome',
+    'event': 'Event',
+    'variant': 'Variant',
+    'source': 'Source'
+}
+
+@st.cache_resource(max_entries=4)
+def build_crosstab_tensor(dataset_key, _df):
+    """Count games over every crosstab dimension at once, keeping only observed combinations
+
+    The tensor is (codes, counts): one row of category codes per combination that occurs
+    and its game count, so its size follows the data rather than the product of cardinalities.
+    """
+    categoricals = [
+        pd.Categorical(_df[col].fillna('Unknown').astype(str)) for col in CROSSTAB_DIMENSIONS
+    ]
+    shape = tuple(len(cat.categories) for cat in categoricals)
+    flat_index = np.ravel_multi_index([cat.codes for cat in categoricals], shape)
+    observed, counts = np.unique(flat_index, return_counts=True)
+    codes = np.column_stack(np.unravel_index(observed, shape)).astype(np.int32)
+    categories = {col: list(cat.categories) for col, cat in zip(CROSSTAB_DIMENSIONS, categoricals)}
+    return (codes, counts), categories
+
+def crosstab_marginal(tensor, categories, dims, filters=None):
+    """Reduce the crosstab tensor to a 1D Series or 2D DataFrame over the given dimensions"""
+    axes = list(CROSSTAB_DIMENSIONS)
+    codes, counts = tensor
+
+    # Drill down by keeping only combinations with a selected value along each filtered axis
+    keep = np.ones(len(counts), dtype=bool)
+    for col, values in (filters or {}).items():
+        if values:
+            selected = np.array([value in values for value in categories[col]], dtype=bool)
+            keep &= selected[codes[:, axes.index(col)]]
+    codes, counts = codes[keep], counts[keep]
+
+    if len(dims) == 1:
+        labels = categories[dims[0]]
+        totals = np.bincount(codes[:, axes.index(dims[0])], weights=counts, minlength=len(labels))
+        series = pd.Series(totals.astype(np.int64), index=labels, name='count')
+        return series[series > 0].sort_values(ascending=False, kind='stable')
+
+    # Only categories that still have games become rows and columns
+    row_codes, row_index = np.unique(codes[:, axes.index(dims[0])], return_inverse=True)
+    col_codes, col_index = np.unique(codes[:, axes.index(dims[1])], return_inverse=True)
+    table = np.zeros((len(row_codes), len(col_codes)), dtype=np.int64)
+    np.add.at(table, (row_index, col_index), counts)
+    return pd.DataFrame(
+        table,
+        index=[categories[dims[0]][i] for i in row_codes],
+        columns=[categories[dims[1]][i] for i in col_codes]
+    )
+
+# Engine evaluation pipeline
+ENGINE_PATH_ENV = 'CHESS_ENGINE_PATH'
+ENGINE_CACHE_PATH = '.engine_cache.sqlite'
+MATE_SCORE = 10000
+CP_LOSS_CAP = 1000
+BLUNDER_THRESHOLD = 300
+MOVETEXT_RESULTS = {'1-0', '0-1', '1/2-1/2', '*'}
+
+def configured_engine_path():
+    """UCI engine binary set by the operator: CHESS_ENGINE_PATH, else stockfish on the server PATH"""
+    return os.environ.get(ENGINE_PATH_ENV) or shutil.which('stockfish')
+
+def standard_games(df):
+    """Mask of games that start from the standard position and can be replayed from SAN"""
+    if 'variant' in df.columns:
+        return df['variant'].eq('Standard').to_numpy()
+    return np.ones(len(df), dtype=bool)
+
+def replay_positions(moves):
+    """Replay SAN movetext and return the board before the first move and after every ply
+
+    Returns None when a move cannot be read, since scoring a truncated game would misreport it.
+    """
+    import chess
+    
+    board = chess.Board()
+    boards = [board.copy(stack=False)]
+    if pd.isna(moves):
+        return boards
+    for token in str(moves).split():
+        if token.endswith('.') or token in MOVETEXT_RESULTS:
+            continue
+        try:
+            board.push_san(token)
+        except ValueError:
+            return None
+        boards.append(board.copy(stack=False))
+    return boards
+
+def load_evaluation_cache(cache_path, limit_key):
+    """Load cached evaluations for one search limit as {position hash: white centipawns}"""
+    import sqlite3
+    
+    with sqlite3.connect(cache_path) as conn:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS evaluations "
+            "(position TEXT, search_limit TEXT, score INTEGER, PRIMARY KEY (position, search_limit))"
+        )
+        rows = conn.execute(
+            "SELECT position, score FROM evaluations WHERE search_limit = ?", (limit_key,)
+        ).fetchall()
+    return {position: score for position, score in rows}
+
+def save_evaluation_cache(cache_path, limit_key, evaluations):
+    """Persist new evaluations so repeated positions are never sent to the engine again"""
+    import sqlite3
+    
+    with sqlite3.connect(cache_path) as conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO evaluations VALUES (?, ?, ?)",
+            [(position, limit_key, score) for position, score in evaluations.items()]
+        )
+
+def terminal_evaluation(board):
+    """Score finished positions without asking the engine"""
+    import chess
+    
+    if board.is_checkmate():
+        return -MATE_SCORE if board.turn == chess.WHITE else MATE_SCORE
+    return 0
+
+async def evaluate_positions(positions, engine_path, workers, limit):
+    """Evaluate positions across a pool of UCI engine processes sharing one work queue
+
+    Returns (evaluations, errors). A failing worker hands its position back to the queue
+    and stops; the others keep going, so evaluations holds everything that finished.
+    """
+    import asyncio
+    import chess.engine
+    
+    queue = asyncio.Queue()
+    for item in positions.items():
+        queue.put_nowait(item)
+    results = {}
+
+    async def engine_worker():
+        _, engine = await chess.engine.popen_uci(engine_path)
+        try:
+            while not queue.empty():
+                key, board = queue.get_nowait()
+                try:
+                    info = await engine.analyse(board, limit)
+                except chess.engine.EngineError:
+                    queue.put_nowait((key, board))
+                    raise
+                results[key] = info['score'].white().score(mate_score=MATE_SCORE)
+        finally:
+            await engine.quit()
+
+    outcomes = await asyncio.gather(
+        *(engine_worker() for _ in range(min(workers, len(positions)))), return_exceptions=True
+    )
+    return results, [outcome for outcome in outcomes if isinstance(outcome, Exception)]
+
+@st.cache_data(show_spinner=False)
+def analyze_games_with_engine(df, engine_path, workers=4, depth=None, nodes=None,
+                              cache_path=ENGINE_CACHE_PATH):
+    """Compute per-game centipawn loss and blunder counts with a local UCI engine
+
+    Non-standard variants and games with an unreadable move get NaN metrics.
+    """
+    import asyncio
+    import chess.engine
+    import chess.polyglot
+    
+    limit = chess.engine.Limit(depth=depth, nodes=nodes)
+    limit_key = f"depth={depth},nodes={nodes}"
+    evaluations = load_evaluation_cache(cache_path, limit_key)
+
+    # Replay every game once and collect the positions no cache entry covers yet
+    game_keys = []
+    pending = {}
+    for moves, standard in zip(df['moves'], standard_games(df)):
+        boards = replay_positions(moves) if standard else None
+        if boards is None:
+            game_keys.append(None)
+            continue
+        keys = []
+        for board in boards:
+            key = f"{chess.polyglot.zobrist_hash(board):016x}"
+            keys.append(key)
+            if key in evaluations or key in pending:
+                continue
+            if board.is_game_over():
+                evaluations[key] = terminal_evaluation(board)
             else:
-                return 'Draw'
-        
-        df['winner'] = df['result'].apply(get_winner)
-        df['utcdate'] = pd.to_datetime(df['utcdate'], errors='coerce')
-        
-        # Convert Elo columns to numeric
-        df['whiteelo'] = pd.to_numeric(df['whiteelo'], errors='coerce')
-        df['blackelo'] = pd.to_numeric(df['blackelo'], errors='coerce')
-        
-        # Add computed columns
-        df['avg_elo'] = (df['whiteelo'] + df['blackelo']) / 2
-        df['num_moves'] = df['moves'].apply(lambda x: len(str(x).strip().split()) if pd.notna(x) else 0)
-        
-        # Add month column
-        df['month'] = df['utcdate'].dt.to_period('M')
-        
+                pending[key] = board
+        game_keys.append(keys)
+
+    if pending:
+        new_evaluations, errors = asyncio.run(evaluate_positions(pending, engine_path, workers, limit))
+        # Persist whatever finished before reporting a failure, so a rerun resumes from the cache
+        save_evaluation_cache(cache_path, limit_key, new_evaluations)
+        if len(new_evaluations) < len(pending):
+            raise errors[0]
+        evaluations.update(new_evaluations)
+
+    records = []
+    for keys in game_keys:
+        if keys is None:
+            records.append(dict.fromkeys(
+                ['white_acpl', 'black_acpl', 'white_blunders', 'black_blunders'], np.nan
+            ))
+            continue
+        scores = np.clip([evaluations[key] for key in keys], -CP_LOSS_CAP, CP_LOSS_CAP)
+        # Loss is measured from the mover's side: White moves on even plies, Black on odd
+        swings = np.diff(scores)
+        white_loss = np.maximum(-swings[0::2], 0)
+        black_loss = np.maximum(swings[1::2], 0)
+        records.append({
+            'white_acpl': white_loss.mean() if len(white_loss) else np.nan,
+            'black_acpl': black_loss.mean() if len(black_loss) else np.nan,
+            'white_blunders': int((white_loss >= BLUNDER_THRESHOLD).sum()),
+            'black_blunders': int((black_loss >= BLUNDER_THRESHOLD).sum())
+        })
+    return pd.DataFrame(records, index=df.index)
+
+# Game length and phase store
+GAME_PHASES = ['Opening', 'Middlegame', 'Endgame']
+MIDDLEGAME_PIECES = 10
+ENDGAME_PIECES = 6
+SPARSE_BACK_RANK = 4
+MOVE_BIN_WIDTH = 10
+SCATTER_SAMPLE_SIZE = 1000
+SAMPLE_SEED = 42
+
+def game_phase_boundaries(moves):
+    """Replay SAN movetext and return (replayed, middlegame start ply, endgame start ply)
+
+    Phases follow a Lichess-style material divider: the middlegame starts once at most
+    MIDDLEGAME_PIECES queens, rooks and minors remain or either back rank thins out, and
+    the endgame once at most ENDGAME_PIECES remain. Boundaries never reached are -1;
+    replayed is False when an unreadable move stops the replay before the phases are known.
+    """
+    import chess
+    
+    board = chess.Board()
+    middlegame = endgame = -1
+    if pd.isna(moves):
+        return True, middlegame, endgame
+    ply = 0
+    for token in str(moves).split():
+        if token.endswith('.') or token in MOVETEXT_RESULTS:
+            continue
+        try:
+            board.push_san(token)
+        except ValueError:
+            return False, middlegame, endgame
+        ply += 1
+        pieces = chess.popcount(board.occupied & ~board.pawns & ~board.kings)
+        if middlegame < 0 and (
+            pieces <= MIDDLEGAME_PIECES
+            or chess.popcount(board.occupied_co[chess.WHITE] & chess.BB_RANK_1) < SPARSE_BACK_RANK
+            or chess.popcount(board.occupied_co[chess.BLACK] & chess.BB_RANK_8) < SPARSE_BACK_RANK
+        ):
+            middlegame = ply
+        if pieces <= ENDGAME_PIECES:
+            # Material only comes off the board, so the rest of the game cannot move either boundary
+            return True, middlegame, ply
+    return True, middlegame, endgame
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def build_game_phases(dataset_key, _df):
+    """Replay every standard game once per dataset into int16 phase boundaries aligned with df"""
+    standard = standard_games(_df)
+    replayed = np.zeros(len(_df), dtype=bool)
+    middlegame = np.full(len(_df), -1, dtype=np.int16)
+    endgame = np.full(len(_df), -1, dtype=np.int16)
+    moves = _df['moves'].to_numpy()
+    for position in np.flatnonzero(standard):
+        replayed[position], middlegame[position], endgame[position] = game_phase_boundaries(moves[position])
+    return pd.DataFrame(
+        {'replayed': replayed, 'middlegame_ply': middlegame, 'endgame_ply': endgame}, index=_df.index
+    )
+
+def phase_lengths(plies, middlegame, endgame):
+    """Split each game's plies into opening, middlegame and endgame lengths as an (n, 3) int16 array"""
+    plies = np.asarray(plies, dtype=np.int32)
+    middlegame_start = np.where(middlegame >= 0, middlegame, plies)
+    endgame_start = np.where(endgame >= 0, endgame, plies)
+    return np.column_stack([
+        middlegame_start, endgame_start - middlegame_start, plies - endgame_start
+    ]).astype(np.int16)
+
+def phase_profile(df, phases, column, top_n=8):
+    """Average phase lengths in plies for the top_n most common categories of column"""
+    replayed = phases['replayed'].to_numpy()
+    lengths = phase_lengths(
+        df['plies'].to_numpy()[replayed],
+        phases['middlegame_ply'].to_numpy()[replayed],
+        phases['endgame_ply'].to_numpy()[replayed]
+    )
+    codes, categories = pd.factorize(df[column].to_numpy()[replayed])
+    known = codes >= 0
+    codes, lengths = codes[known], lengths[known]
+    games = np.bincount(codes, minlength=len(categories))
+    top = np.argsort(-games, kind='stable')[:top_n]
+    totals = np.column_stack([
+        np.bincount(codes, weights=lengths[:, phase], minlength=len(categories))
+        for phase in range(len(GAME_PHASES))
+    ])
+    return pd.DataFrame(totals[top] / games[top, None], index=categories[top], columns=GAME_PHASES)
+
+def length_distribution(lengths, bin_width=MOVE_BIN_WIDTH):
+    """Exact game-length histogram from one bincount, labelled by band"""
+    counts = np.bincount(np.asarray(lengths, dtype=np.intp) // bin_width)
+    return pd.Series(
+        counts, index=[f"{band * bin_width}-{(band + 1) * bin_width - 1}" for band in range(len(counts))]
+    )
+
+@st.cache_resource(max_entries=12)
+def build_length_rating_density(dataset_key, _df, elo_bin_width=100, move_bin_width=MOVE_BIN_WIDTH):
+    """Count every rated game into a (game length band, rating band) grid for density heatmaps"""
+    rated = _df['avg_elo'].notna().to_numpy()
+    if not rated.any():
+        return pd.DataFrame()
+    elo_codes = (_df['avg_elo'].to_numpy()[rated] // elo_bin_width).astype(np.intp)
+    move_codes = _df['num_moves'].to_numpy()[rated].astype(np.intp) // move_bin_width
+    elo_low = elo_codes.min()
+    shape = (move_codes.max() + 1, elo_codes.max() - elo_low + 1)
+    flat_index = np.ravel_multi_index((move_codes, elo_codes - elo_low), shape)
+    grid = np.bincount(flat_index, minlength=shape[0] * shape[1]).reshape(shape)
+    # Longest games on the top row so the y axis reads upwards
+    return pd.DataFrame(
+        grid[::-1],
+        index=[f"{band * move_bin_width}-{(band + 1) * move_bin_width - 1}" for band in range(shape[0])][::-1],
+        columns=[f"{(elo_low + band) * elo_bin_width}" for band in range(shape[1])]
+    )
+
+def stratified_sample(df, column, size=SCATTER_SAMPLE_SIZE, seed=SAMPLE_SEED):
+    """Deterministic proportional sample: seeded shuffle within each stratum, then evenly spaced picks"""
+    if len(df) <= size:
         return df
-    except Exception as e:
-        st.error(f"❌ Error processing data: {str(e)}")
-        return None
+    shuffle_keys = np.random.default_rng(seed).random(len(df))
+    order = np.lexsort((shuffle_keys, pd.factorize(df[column])[0]))
+    picks = order[np.arange(size) * len(df) // size]
+    return df.iloc[np.sort(picks)]
 
 def create_premium_plotly_chart(chart_type, data=None, x=None, y=None, title="", **kwargs):
     """Create premium dark-themed Plotly charts with Chess.com colors"""
+    import plotly.express as px
     
     # Chess.com inspired color palette
     colors = {
@@ -461,6 +1198,284 @@ def create_premium_plotly_chart(chart_type, data=None, x=None, y=None, title="",
     fig.update_layout(**layout_settings)
     return fig
 
+# Game browser indexes
+BROWSER_SEARCH_COLUMNS = ['white', 'black', 'eco', 'termination', 'event', 'timecontrol']
+BROWSER_COLUMNS = [
+    'utcdate', 'white', 'black', 'result', 'whiteelo', 'blackelo',
+    'eco', 'timecontrol', 'termination', 'num_moves'
+]
+
+@st.cache_resource(max_entries=16)
+def build_sort_index(dataset_key, _df, column, ascending=True):
+    """Row positions ordering the games by one column, plus each row's rank in that order"""
+    order = (
+        _df[column].reset_index(drop=True)
+        .sort_values(ascending=ascending, kind='stable', na_position='last')
+        .index.to_numpy()
+    )
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    return order, rank
+
+@st.cache_resource(max_entries=16)
+def build_search_index(dataset_key, _df, column):
+    """Lowercased column values in sorted order for binary-search prefix lookups"""
+    keys = _df[column].fillna('').astype(str).str.lower().to_numpy()
+    order = np.argsort(keys, kind='stable')
+    return keys[order], order
+
+def find_game_positions(dataset_key, df, sort_column, ascending=True, search_column=None, search_text=''):
+    """Row positions of the matching games in display order, resolved from the prebuilt indexes
+
+    The indexes are shared per dataset_key without hashing or copying the frame, so a page
+    change only costs the lookup. Callers must not modify the returned arrays.
+    """
+    order, rank = build_sort_index(dataset_key, df, sort_column, ascending)
+    
+    if search_text and search_column:
+        sorted_keys, search_order = build_search_index(dataset_key, df, search_column)
+        prefix = search_text.strip().lower()
+        start = np.searchsorted(sorted_keys, prefix, side='left')
+        end = np.searchsorted(sorted_keys, prefix + '\U0010ffff', side='left')
+        matches = search_order[start:end]
+        return matches[np.argsort(rank[matches], kind='stable')]
+    return order
+
+# Streaming exports
+EXPORT_FORMATS = {
+    'CSV': ('csv', 'text/csv'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet'),
+    'JSON': ('jsonl', 'application/x-ndjson')
+}
+EXPORT_CHUNK_ROWS = 100_000
+
+def stream_export(df, export_format, positions=None):
+    """Write a frame chunk by chunk into an anonymous temp file and return it rewound for download"""
+    n_rows = len(df) if positions is None else len(positions)
+    buffer = tempfile.TemporaryFile()
+    writer = None
+    text = None if export_format == 'Parquet' else io.TextIOWrapper(buffer, encoding='utf-8', newline='')
+    
+    for start in range(0, max(n_rows, 1), EXPORT_CHUNK_ROWS):
+        rows = slice(start, start + EXPORT_CHUNK_ROWS)
+        chunk = df.iloc[rows] if positions is None else df.iloc[positions[rows]]
+        # Periods have no CSV/JSON/Parquet equivalent, so export them as their labels
+        chunk = chunk.assign(**{
+            col: chunk[col].astype(str)
+            for col in chunk.columns if isinstance(chunk[col].dtype, pd.PeriodDtype)
+        })
+        
+        if export_format == 'CSV':
+            chunk.to_csv(text, index=False, header=start == 0)
+        elif export_format == 'JSON':
+            if len(chunk):
+                chunk.to_json(text, orient='records', lines=True, date_format='iso')
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            
+            # Object columns (e.g. raw quarantined values) can mix ints, floats and strings,
+            # so the Arrow type inferred per chunk would drift; write them all as strings
+            chunk = chunk.assign(**{
+                col: chunk[col].astype('string') for col in chunk.columns if chunk[col].dtype == object
+            })
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(buffer, table.schema)
+            writer.write_table(table.cast(writer.schema))
+    
+    if writer is not None:
+        writer.close()
+    if text is not None:
+        text.flush()
+        text.detach()
+    
+    # Hand over the unbuffered file so Streamlit reads it straight from disk
+    buffer.flush()
+    raw = buffer.detach()
+    raw.seek(0)
+    return raw
+
+def render_export_button(df, name, export_format, key, positions=None):
+    """Offer a frame for download, generating the file only when the button is clicked"""
+    extension, mime = EXPORT_FORMATS[export_format]
+    st.download_button(
+        f"⬇️ Download {export_format}",
+        data=lambda: stream_export(df, export_format, positions),
+        file_name=f"{name}.{extension}",
+        mime=mime,
+        on_click="ignore",
+        key=key
+    )
+
+# Embedded SQL engine
+SQL_DEFAULT_QUERY = """SELECT timecontrol, termination, count(*) AS games
+FROM games
+GROUP BY ALL
+ORDER BY games DESC
+LIMIT 20"""
+
+@st.cache_resource(max_entries=4)
+def open_games_database(dataset_key, _df):
+    """Sandboxed in-memory DuckDB database and an Arrow copy of the games, shared per dataset
+
+    The Arrow table keeps row order in game_index. User queries run here too, so the
+    database is kept away from files, URLs and extensions.
+    """
+    import duckdb
+    import pyarrow as pa
+    
+    # Arrow has no Period type, so months become their 'YYYY-MM' labels
+    frame = _df.assign(**{
+        col: _df[col].dt.strftime('%Y-%m')
+        for col in _df.columns if isinstance(_df[col].dtype, pd.PeriodDtype)
+    })
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    table = table.append_column('game_index', pa.array(np.arange(len(_df), dtype=np.int64)))
+    conn = duckdb.connect(config={'enable_external_access': False, 'lock_configuration': True})
+    return conn, table
+
+def run_games_query(dataset_key, df, sql, params=None):
+    """Run SQL in an in-process DuckDB session where the processed games are the `games` table
+
+    Each query gets its own cursor, so concurrent sessions never share state and the
+    Arrow table is registered without copying.
+    """
+    conn, table = open_games_database(dataset_key, df)
+    with conn.cursor() as cursor:
+        cursor.register('games', table)
+        return cursor.execute(sql, params or []).df()
+
+@st.cache_data(max_entries=64)
+def sql_value_counts(dataset_key, _df, column, limit=None):
+    """Series.value_counts() as a query: counts descending, ties in order of first appearance"""
+    result = run_games_query(dataset_key, _df, f"""
+        SELECT "{column}", count(*) AS count
+        FROM games
+        WHERE "{column}" IS NOT NULL
+        GROUP BY "{column}"
+        ORDER BY count DESC, min(game_index)
+        {f'LIMIT {int(limit)}' if limit else ''}
+    """)
+    return result.set_index(column)['count']
+
+@st.cache_data(max_entries=64)
+def sql_monthly_games(dataset_key, _df):
+    """Games per calendar month in chronological order"""
+    return run_games_query(dataset_key, _df, """
+        SELECT month, count(*) AS games
+        FROM games
+        WHERE month IS NOT NULL
+        GROUP BY month
+        ORDER BY month
+    """)
+
+@st.cache_data(max_entries=64)
+def sql_correlation(dataset_key, _df, columns):
+    """Pairwise-complete Pearson correlation matrix, matching DataFrame.corr()"""
+    pairs = [(a, b) for i, a in enumerate(columns) for b in columns[i:]]
+    select = ', '.join(f'corr("{a}", "{b}") AS "{a}|{b}"' for a, b in pairs)
+    row = run_games_query(dataset_key, _df, f"SELECT {select} FROM games").iloc[0]
+    matrix = pd.DataFrame(np.nan, index=columns, columns=columns)
+    for a, b in pairs:
+        matrix.loc[a, b] = matrix.loc[b, a] = 1.0 if a == b else row[f"{a}|{b}"]
+    return matrix
+
+@st.cache_data(max_entries=64)
+def sql_game_statistics(dataset_key, _df):
+    """Headline statistics for the comprehensive statistics table in one scan"""
+    stats = run_games_query(dataset_key, _df, """
+        SELECT
+            count(*) AS total_games,
+            (SELECT count(DISTINCT player) FROM (
+                SELECT white AS player FROM games UNION ALL SELECT black FROM games
+            )) AS unique_players,
+            avg(avg_elo) AS avg_rating,
+            stddev_samp(avg_elo) AS rating_std,
+            max(avg_elo) AS peak_rating,
+            count(*) FILTER (WHERE winner = 'White') AS white_wins,
+            count(*) FILTER (WHERE winner = 'Black') AS black_wins,
+            count(*) FILTER (WHERE winner = 'Draw') AS draws,
+            min(num_moves) AS shortest_game,
+            max(num_moves) AS longest_game,
+            avg(num_moves) AS avg_moves
+        FROM games
+    """).to_dict(orient='records')[0]
+    
+    # Series.mode() breaks ties by taking the smallest value
+    for column in ['eco', 'timecontrol']:
+        mode = run_games_query(dataset_key, _df, f"""
+            SELECT "{column}" FROM games
+            WHERE "{column}" IS NOT NULL
+            GROUP BY "{column}"
+            ORDER BY count(*) DESC, "{column}"
+            LIMIT 1
+        """)
+        stats[f'{column}_mode'] = mode.iloc[0, 0] if len(mode) else 'N/A'
+    return stats
+
+# Rendered figure cache
+FIGURE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+@st.cache_resource
+def get_figure_cache():
+    """Shared LRU store of serialized figures plus hit/miss counters"""
+    return {
+        'figures': OrderedDict(),
+        'bytes': 0,
+        'hits': 0,
+        'misses': 0,
+        'evictions': 0,
+        'lock': threading.Lock()
+    }
+
+def render_premium_chart(chart_type, data=None, x=None, y=None, title="", layout=None,
+                         cache_key=None, **kwargs):
+    """Render a premium chart, reusing the serialized figure when nothing it depends on changed
+
+    cache_key should identify the dataset, chart style and any filter state the
+    chart data was derived from; chart type, columns, title and layout are added here.
+    """
+    import plotly.io as pio
+    
+    cache = get_figure_cache()
+    key = None
+    if cache_key is not None:
+        parts = (
+            cache_key, chart_type,
+            x if isinstance(x, str) else None,
+            y if isinstance(y, str) else None,
+            title, layout, sorted(kwargs.items())
+        )
+        key = hashlib.sha1(repr(parts).encode()).hexdigest()
+        with cache['lock']:
+            spec = cache['figures'].get(key)
+            if spec is not None:
+                cache['figures'].move_to_end(key)
+                cache['hits'] += 1
+        if spec is not None:
+            st.plotly_chart(pio.from_json(spec, skip_invalid=True), use_container_width=True)
+            return
+    
+    fig = create_premium_plotly_chart(chart_type, data=data, x=x, y=y, title=title, **kwargs)
+    if layout:
+        fig.update_layout(**layout)
+    
+    if key is not None:
+        spec = pio.to_json(fig, validate=False)
+        with cache['lock']:
+            cache['misses'] += 1
+            if key not in cache['figures'] and len(spec) <= FIGURE_CACHE_MAX_BYTES:
+                cache['figures'][key] = spec
+                cache['bytes'] += len(spec)
+                # Evict least recently used figures until back under the size bound
+                while cache['bytes'] > FIGURE_CACHE_MAX_BYTES:
+                    _, evicted = cache['figures'].popitem(last=False)
+                    cache['bytes'] -= len(evicted)
+                    cache['evictions'] += 1
+    
+    st.plotly_chart(fig, use_container_width=True)
+
 def create_animated_metric_card(title, value, icon, trend=None):
     """Create animated metric cards with Chess.com theme"""
     trend_indicator = ""
@@ -492,6 +1507,8 @@ def show_loading_animation(text="Processing chess data"):
 
 # Main app
 def main():
+    apply_page_theme()
+    
     # Premium Header
     st.markdown("""
     <div class="chess-master-header">
@@ -513,17 +1530,35 @@ def main():
         
         # File upload with premium styling
         st.markdown("### 📁 Data Upload")
-        uploaded_file = st.file_uploader(
+        uploaded_files = st.file_uploader(
             "Upload Chess Games CSV",
             type=['csv'],
-            help="Upload your Lichess games CSV file for professional analysis",
+            accept_multiple_files=True,
+            help="Upload one or more Lichess games CSV files for professional analysis",
             label_visibility="collapsed"
         )
+        # Server-side loading is only offered under a directory the operator has opened up
+        data_root = configured_data_root()
+        server_pattern = data_root and st.text_input(
+            "Server Directory or Glob",
+            placeholder="lichess/*.csv",
+            help=f"Load CSV files from a directory or glob pattern under {data_root} on the server"
+        )
         
-        if uploaded_file:
-            st.markdown('<div class="success-master">✅ File loaded successfully!</div>', unsafe_allow_html=True)
+        sources = [(file.name, file, file.file_id) for file in uploaded_files or []]
+        if server_pattern:
+            server_sources = resolve_server_sources(server_pattern, data_root)
+            if not server_sources:
+                st.warning(f"No CSV files match {server_pattern}")
+            sources += server_sources
+        
+        if sources:
+            st.markdown(
+                f'<div class="success-master">✅ {len(sources)} file{"s" if len(sources) > 1 else ""} loaded successfully!</div>',
+                unsafe_allow_html=True
+            )
     
-    if uploaded_file is not None:
+    if sources:
         # Loading animation
         loading_placeholder = st.empty()
         with loading_placeholder:
@@ -533,9 +1568,14 @@ def main():
         time.sleep(1)
         
         # Load and process data
-        df = load_and_process_data(uploaded_file)
+        df, quarantine = load_and_process_data(sources)
         loading_placeholder.empty()
         
+        if df.empty:
+            st.error("❌ No valid games found - every row failed validation.")
+            show_quarantine_report(quarantine)
+            df = None
+        
         if df is not None:
             # Sidebar Analysis Controls
             with st.sidebar:
@@ -550,12 +1590,69 @@ def main():
                     "👑 Player Insights": st.checkbox("👑 Player Performance", True),
                     "⏱️ Time Controls": st.checkbox("⏱️ Time Control Analysis", True),
                     "📈 Trend Analysis": st.checkbox("📈 Trend Analysis", True),
-                    "🔬 Advanced Stats": st.checkbox("🔬 Advanced Statistics", True)
+                    "🧩 Game Structure": st.checkbox("🧩 Game Structure Analysis", False),
+                    "🕐 Time of Day": st.checkbox("🕐 Time of Day Analysis", True),
+                    "🔥 Sessions & Tilt": st.checkbox("🔥 Session & Tilt Analysis", True),
+                    "🗂️ Source Comparison": st.checkbox("🗂️ Source Comparison", True),
+                    "🧮 SQL Explorer": st.checkbox("🧮 SQL Explorer", True),
+                    "🔬 Advanced Stats": st.checkbox("🔬 Advanced Statistics", True),
+                    "♞ Engine Analysis": st.checkbox("♞ Engine Accuracy Analysis", False)
                 }
                 
                 st.markdown("### ⚙️ Customization")
                 chart_style = st.selectbox("Chart Style", ["Professional", "Minimal", "Vibrant"])
                 show_animations = st.checkbox("Enable Animations", True)
+                
+                st.markdown("### 📦 Export")
+                export_format = st.selectbox("Export Format", list(EXPORT_FORMATS))
+                
+                if modules["♞ Engine Analysis"]:
+                    st.markdown("### ♞ Engine Settings")
+                    # The binary comes from server configuration, never from the page
+                    engine_path = configured_engine_path()
+                    if engine_path:
+                        st.caption(f"Engine: `{os.path.basename(engine_path)}`")
+                    engine_workers = st.slider("Engine Workers", 1, 16, 4)
+                    engine_limit = st.radio("Search Limit", ["Depth", "Nodes"], horizontal=True)
+                    if engine_limit == "Depth":
+                        engine_depth, engine_nodes = st.slider("Depth", 6, 24, 12), None
+                    else:
+                        engine_depth, engine_nodes = None, st.select_slider(
+                            "Nodes", [10_000, 50_000, 100_000, 500_000, 1_000_000], 100_000
+                        )
+            
+            # Join per-game engine metrics so every module can use them
+            if modules["♞ Engine Analysis"]:
+                if not engine_path:
+                    st.warning(
+                        f"♞ Engine analysis needs a UCI engine; set {ENGINE_PATH_ENV} on the server, "
+                        "e.g. to a local Stockfish binary."
+                    )
+                    modules["♞ Engine Analysis"] = False
+                else:
+                    import chess.engine
+                    
+                    try:
+                        with st.spinner("♞ Evaluating positions with the engine..."):
+                            engine_metrics = analyze_games_with_engine(
+                                df, engine_path, engine_workers, engine_depth, engine_nodes
+                            )
+                        df = df.join(engine_metrics)
+                    except (OSError, chess.engine.EngineError) as e:
+                        st.error(f"❌ Engine analysis failed: {str(e)}")
+                        modules["♞ Engine Analysis"] = False
+            
+            # Per-dataset stores are keyed on the source files and engine settings, figures also on chart style
+            dataset_key = tuple((name, version) for name, _, version in sources)
+            if modules["♞ Engine Analysis"]:
+                dataset_key += (engine_path, engine_depth, engine_nodes)
+            chart_scope = (dataset_key, chart_style)
+            
+            # Shared categorical counts for outcome, termination, time control and event charts
+            crosstab, crosstab_categories = build_crosstab_tensor(dataset_key, df)
+            
+            if not quarantine.empty:
+                show_quarantine_report(quarantine, export_format)
             
             # Performance Overview
             if modules["📊 Performance Overview"]:
@@ -593,17 +1690,66 @@ def main():
                         "Avg Game Length", f"{avg_moves:.0f}", "♟️"
                     ), unsafe_allow_html=True)
                 
-                # Enhanced data preview
-                st.markdown("### 📋 Data Preview")
-                st.dataframe(
-                    df.head(10).style.format({
-                        'avg_elo': '{:.0f}',
+                # Paginated game browser
+                st.markdown("### 📋 Game Browser")
+                browser_columns = [col for col in BROWSER_COLUMNS if col in df.columns]
+                
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    search_column = st.selectbox("Search In", BROWSER_SEARCH_COLUMNS, key="browser_search_column")
+                with col2:
+                    search_text = st.text_input("Starts With", key="browser_search_text")
+                with col3:
+                    sort_column = st.selectbox("Sort By", browser_columns, key="browser_sort_column")
+                with col4:
+                    sort_ascending = st.radio(
+                        "Order", ["Ascending", "Descending"], horizontal=True, key="browser_sort_order"
+                    ) == "Ascending"
+                
+                page_size = 25
+                game_positions = find_game_positions(
+                    dataset_key, df, sort_column, sort_ascending, search_column, search_text
+                )
+                total_pages = max(1, -(-len(game_positions) // page_size))
+                page_number = st.number_input(
+                    f"Page (of {total_pages:,} • {len(game_positions):,} games)",
+                    min_value=1, max_value=total_pages, value=1, key="browser_page"
+                )
+                page_start = (min(page_number, total_pages) - 1) * page_size
+                page_df = df.iloc[game_positions[page_start:page_start + page_size]]
+                
+                # Streamlit keeps a table's selection when its data changes, so key the table
+                # on everything that decides which games are on the page
+                browser_view = (dataset_key, search_column, search_text, sort_column, sort_ascending, page_number)
+                browser_event = st.dataframe(
+                    page_df[browser_columns].style.format({
                         'whiteelo': '{:.0f}',
                         'blackelo': '{:.0f}',
                         'num_moves': '{:.0f}'
                     }),
-                    use_container_width=True
+                    use_container_width=True,
+                    hide_index=True,
+                    on_select="rerun",
+                    selection_mode="single-row",
+                    key=f"browser_table_{hashlib.sha1(repr(browser_view).encode()).hexdigest()[:12]}"
                 )
+                
+                # Selected game details
+                selected_rows = browser_event.selection.rows
+                if selected_rows and selected_rows[0] < len(page_df):
+                    game = page_df.iloc[selected_rows[0]]
+                    st.markdown(f"#### ♟️ {game['white']} vs {game['black']} • {game['result']}")
+                    col1, col2 = st.columns([1, 2])
+                    with col1:
+                        metadata = game.drop(labels=['moves']).astype(str)
+                        st.dataframe(
+                            metadata.rename('value').to_frame(), use_container_width=True
+                        )
+                    with col2:
+                        st.code(str(game['moves']), language=None, wrap_lines=True)
+                
+                st.markdown(f"**Export {len(game_positions):,} matching games**")
+                render_export_button(df, "games", export_format, "export_games", positions=game_positions)
             
             # Game Outcomes Analysis
             if modules["🎯 Game Outcomes"]:
@@ -616,21 +1762,26 @@ def main():
                 col1, col2 = st.columns(2)
                 
                 with col1:
-                    outcomes = df['winner'].value_counts()
-                    fig_pie = create_premium_plotly_chart(
+                    outcomes = crosstab_marginal(crosstab, crosstab_categories, ['winner'])
+                    render_premium_chart(
                         'pie', x=outcomes.index, y=outcomes.values,
-                        title="🎯 Game Outcome Distribution"
+                        title="🎯 Game Outcome Distribution",
+                        cache_key=chart_scope
                     )
-                    st.plotly_chart(fig_pie, use_container_width=True)
                 
                 with col2:
-                    win_stats = df['winner'].value_counts()
+                    win_stats = crosstab_marginal(crosstab, crosstab_categories, ['winner'])
                     percentages = (win_stats / len(df) * 100).round(1)
-                    fig_bar = create_premium_plotly_chart(
+                    render_premium_chart(
                         'bar', x=percentages.index, y=percentages.values,
-                        title="📊 Win Rate Percentages"
+                        title="📊 Win Rate Percentages",
+                        cache_key=chart_scope
                     )
-                    st.plotly_chart(fig_bar, use_container_width=True)
+                
+                outcomes_export = pd.DataFrame({
+                    'winner': outcomes.index, 'games': outcomes.values, 'percentage': percentages.values
+                })
+                render_export_button(outcomes_export, "outcomes", export_format, "export_outcomes")
             
             # Rating Analytics
             if modules["⭐ Rating Analytics"]:
@@ -643,20 +1794,20 @@ def main():
                 col1, col2 = st.columns(2)
                 
                 with col1:
-                    fig_hist = create_premium_plotly_chart(
+                    render_premium_chart(
                         'histogram', data=df, x='avg_elo',
-                        title="📈 Rating Distribution Analysis"
+                        title="📈 Rating Distribution Analysis",
+                        cache_key=chart_scope
                     )
-                    st.plotly_chart(fig_hist, use_container_width=True)
                 
                 with col2:
                     df_sorted = df.dropna(subset=['utcdate', 'avg_elo']).sort_values('utcdate')
                     if len(df_sorted) > 0:
-                        fig_trend = create_premium_plotly_chart(
+                        render_premium_chart(
                             'line', data=df_sorted, x='utcdate', y='avg_elo',
-                            title="📊 Rating Progression Over Time"
+                            title="📊 Rating Progression Over Time",
+                            cache_key=chart_scope
                         )
-                        st.plotly_chart(fig_trend, use_container_width=True)
             
             # Game Termination Analysis
             if modules["🏁 Game Termination"]:
@@ -666,13 +1817,47 @@ def main():
                 </div>
                 """, unsafe_allow_html=True)
                 
-                termination_counts = df['termination'].value_counts().head(8)
-                fig_term = create_premium_plotly_chart(
+                termination_counts = crosstab_marginal(crosstab, crosstab_categories, ['termination']).head(8)
+                render_premium_chart(
                     'bar', x=termination_counts.values, y=termination_counts.index,
-                    title="🏁 How Games End - Termination Analysis"
+                    title="🏁 How Games End - Termination Analysis",
+                    layout=dict(yaxis=dict(categoryorder='total ascending')),
+                    cache_key=chart_scope
                 )
-                fig_term.update_layout(yaxis=dict(categoryorder='total ascending'))
-                st.plotly_chart(fig_term, use_container_width=True)
+                terminations_export = crosstab_marginal(
+                    crosstab, crosstab_categories, ['termination']
+                ).rename_axis('termination').reset_index(name='games')
+                render_export_button(terminations_export, "terminations", export_format, "export_terminations")
+                
+                # Termination drill-down
+                st.markdown("### 🔍 Termination Drill-Down")
+                col1, col2 = st.columns(2)
+                with col1:
+                    breakdown_dim = st.selectbox(
+                        "Break Down By",
+                        [dim for dim in CROSSTAB_DIMENSIONS if dim != 'termination'],
+                        format_func=CROSSTAB_DIMENSIONS.get,
+                        key="termination_breakdown"
+                    )
+                with col2:
+                    termination_filter = st.multiselect(
+                        "Filter Time Controls", crosstab_categories['timecontrol'], key="termination_tc_filter"
+                    )
+                
+                termination_table = crosstab_marginal(
+                    crosstab, crosstab_categories, ['termination', breakdown_dim],
+                    filters={'timecontrol': termination_filter}
+                )
+                if termination_table.empty:
+                    st.info("No games match the selected filters.")
+                else:
+                    # Keep the most common columns readable
+                    top_columns = termination_table.sum(axis=0).sort_values(ascending=False).index[:12]
+                    render_premium_chart(
+                        'heatmap', data=termination_table[top_columns],
+                        title=f"🏁 Termination × {CROSSTAB_DIMENSIONS[breakdown_dim]}",
+                        cache_key=(chart_scope, breakdown_dim, tuple(termination_filter))
+                    )
             
             # Opening Analysis
             if modules["♟️ Opening Mastery"]:
@@ -685,21 +1870,53 @@ def main():
                 col1, col2 = st.columns(2)
                 
                 with col1:
-                    eco_counts = df['eco'].value_counts().head(15)
-                    fig_eco = create_premium_plotly_chart(
+                    eco_counts = sql_value_counts(dataset_key, df, 'eco', 15)
+                    render_premium_chart(
                         'bar', x=eco_counts.values, y=eco_counts.index,
-                        title="♟️ Most Popular Opening ECO Codes"
+                        title="♟️ Most Popular Opening ECO Codes",
+                        layout=dict(yaxis=dict(categoryorder='total ascending')),
+                        cache_key=chart_scope
                     )
-                    fig_eco.update_layout(yaxis=dict(categoryorder='total ascending'))
-                    st.plotly_chart(fig_eco, use_container_width=True)
+                    eco_export = sql_value_counts(dataset_key, df, 'eco').reset_index(name='games')
+                    render_export_button(eco_export, "eco_counts", export_format, "export_eco")
                 
                 with col2:
-                    fig_moves = create_premium_plotly_chart(
-                        'histogram', data=df, x='num_moves',
-                        title="📊 Game Length Distribution"
+                    move_distribution = length_distribution(df['num_moves'])
+                    render_premium_chart(
+                        'bar', x=move_distribution.index, y=move_distribution.values,
+                        title="📊 Game Length Distribution (moves)",
+                        cache_key=chart_scope
                     )
-                    st.plotly_chart(fig_moves, use_container_width=True)
-            
+
+                # Opening × rating strategy heatmap
+                st.markdown("### 🔥 Opening Strategy Heatmap")
+                opening_cube, cube_time_controls, cube_eco_codes = build_opening_rating_cube(dataset_key, df)
+
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    heatmap_tcs = st.multiselect("Time Controls", cube_time_controls, key="heatmap_tcs")
+                with col2:
+                    heatmap_bin = st.selectbox("Elo Band Width", [50, 100, 200, 400], index=1, key="heatmap_bin")
+                with col3:
+                    heatmap_metric = st.selectbox(
+                        "Metric", ['Games', 'White Win %', 'Draw %', 'Black Win %'], key="heatmap_metric"
+                    )
+                with col4:
+                    heatmap_top = st.slider("Top Openings", 5, 50, 20, key="heatmap_top")
+
+                heatmap_data = slice_opening_heatmap(
+                    opening_cube, cube_time_controls, cube_eco_codes, heatmap_tcs,
+                    bin_width=heatmap_bin, metric=heatmap_metric, top_n=heatmap_top
+                )
+                if heatmap_data.empty:
+                    st.info("No games match the selected filters.")
+                else:
+                    render_premium_chart(
+                        'heatmap', data=heatmap_data,
+                        title=f"🔥 ECO × Rating Band - {heatmap_metric}",
+                        cache_key=(chart_scope, tuple(heatmap_tcs), heatmap_bin, heatmap_metric, heatmap_top)
+                    )
+
             # Player Analysis
             if modules["👑 Player Insights"]:
                 st.markdown("""
@@ -711,22 +1928,22 @@ def main():
                 col1, col2 = st.columns(2)
                 
                 with col1:
-                    top_white = df['white'].value_counts().head(10)
-                    fig_white = create_premium_plotly_chart(
+                    top_white = sql_value_counts(dataset_key, df, 'white', 10)
+                    render_premium_chart(
                         'bar', x=top_white.values, y=top_white.index,
-                        title="🤍 Most Active White Players"
+                        title="🤍 Most Active White Players",
+                        layout=dict(yaxis=dict(categoryorder='total ascending')),
+                        cache_key=chart_scope
                     )
-                    fig_white.update_layout(yaxis=dict(categoryorder='total ascending'))
-                    st.plotly_chart(fig_white, use_container_width=True)
                 
                 with col2:
-                    top_black = df['black'].value_counts().head(10)
-                    fig_black = create_premium_plotly_chart(
+                    top_black = sql_value_counts(dataset_key, df, 'black', 10)
+                    render_premium_chart(
                         'bar', x=top_black.values, y=top_black.index,
-                        title="⚫ Most Active Black Players"
+                        title="⚫ Most Active Black Players",
+                        layout=dict(yaxis=dict(categoryorder='total ascending')),
+                        cache_key=chart_scope
                     )
-                    fig_black.update_layout(yaxis=dict(categoryorder='total ascending'))
-                    st.plotly_chart(fig_black, use_container_width=True)
             
             # Time Controls Analysis
             if modules["⏱️ Time Controls"]:
@@ -736,13 +1953,41 @@ def main():
                 </div>
                 """, unsafe_allow_html=True)
                 
-                time_controls = df['timecontrol'].value_counts().head(12)
-                fig_time = create_premium_plotly_chart(
+                time_controls = crosstab_marginal(crosstab, crosstab_categories, ['timecontrol']).head(12)
+                render_premium_chart(
                     'bar', x=time_controls.values, y=time_controls.index,
-                    title="⏱️ Most Popular Time Control Formats"
+                    title="⏱️ Most Popular Time Control Formats",
+                    layout=dict(yaxis=dict(categoryorder='total ascending')),
+                    cache_key=chart_scope
                 )
-                fig_time.update_layout(yaxis=dict(categoryorder='total ascending'))
-                st.plotly_chart(fig_time, use_container_width=True)
+                
+                # Time control drill-down
+                selected_tc = st.selectbox(
+                    "Drill Into Time Control", time_controls.index, key="time_control_drill"
+                )
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    tc_terminations = crosstab_marginal(
+                        crosstab, crosstab_categories, ['termination'],
+                        filters={'timecontrol': [selected_tc]}
+                    )
+                    render_premium_chart(
+                        'pie', x=tc_terminations.index, y=tc_terminations.values,
+                        title=f"🏁 How {selected_tc} Games End",
+                        cache_key=(chart_scope, selected_tc)
+                    )
+                
+                with col2:
+                    tc_outcomes = crosstab_marginal(
+                        crosstab, crosstab_categories, ['winner'],
+                        filters={'timecontrol': [selected_tc]}
+                    )
+                    render_premium_chart(
+                        'pie', x=tc_outcomes.index, y=tc_outcomes.values,
+                        title=f"🎯 {selected_tc} Game Outcomes",
+                        cache_key=(chart_scope, selected_tc)
+                    )
             
             # Trend Analysis
             if modules["📈 Trend Analysis"]:
@@ -756,24 +2001,264 @@ def main():
                 
                 with col1:
                     # Monthly game activity
-                    monthly_games = df.groupby('month').size().reset_index()
-                    monthly_games.columns = ['month', 'games']
-                    monthly_games['month_str'] = monthly_games['month'].astype(str)
+                    monthly_games = sql_monthly_games(dataset_key, df)
                     
-                    fig_monthly = create_premium_plotly_chart(
-                        'line', data=monthly_games, x='month_str', y='games',
-                        title="📅 Monthly Gaming Activity Trends"
+                    render_premium_chart(
+                        'line', data=monthly_games, x='month', y='games',
+                        title="📅 Monthly Gaming Activity Trends",
+                        cache_key=chart_scope
+                    )
+                    render_export_button(
+                        monthly_games, "monthly_activity", export_format, "export_monthly"
                     )
-                    st.plotly_chart(fig_monthly, use_container_width=True)
                 
                 with col2:
-                    # Rating vs Game Length scatter
-                    sample_df = df.sample(min(1000, len(df))) if len(df) > 1000 else df
-                    fig_scatter = create_premium_plotly_chart(
+                    # Rating vs Game Length scatter over a seeded sample stratified by time control
+                    sample_df = stratified_sample(df, 'timecontrol')
+                    render_premium_chart(
                         'scatter', data=sample_df, x='avg_elo', y='num_moves',
-                        title="🎯 Rating vs Game Length Correlation"
+                        title="🎯 Rating vs Game Length Correlation",
+                        cache_key=chart_scope
+                    )
+                
+                # Exact density over every game, binned server-side
+                density_bin = st.selectbox("Rating Band Width", [50, 100, 200], index=1, key="density_bin")
+                length_density = build_length_rating_density(dataset_key, df, density_bin)
+                if not length_density.empty:
+                    render_premium_chart(
+                        'heatmap', data=length_density,
+                        title="🌡️ Rating vs Game Length Density (all games)",
+                        layout=dict(xaxis_title="Average Elo", yaxis_title="Moves"),
+                        cache_key=(chart_scope, density_bin)
+                    )
+            
+            # Game Structure Analysis
+            if modules["🧩 Game Structure"]:
+                st.markdown("""
+                <div class="analysis-mastercard">
+                    <h2>🧩 GAME STRUCTURE ANALYSIS</h2>
+                </div>
+                """, unsafe_allow_html=True)
+                
+                with st.spinner("♟️ Replaying games to locate phase boundaries..."):
+                    phases = build_game_phases(dataset_key, df)
+                replayed = phases['replayed'].to_numpy()
+                
+                if not replayed.any():
+                    st.info("No standard games could be replayed.")
+                else:
+                    plies = df['plies'].to_numpy()[replayed]
+                    middlegame_ply = phases['middlegame_ply'].to_numpy()[replayed]
+                    endgame_ply = phases['endgame_ply'].to_numpy()[replayed]
+                    lengths = phase_lengths(plies, middlegame_ply, endgame_ply)
+                    col1, col2, col3, col4 = st.columns(4)
+                    
+                    with col1:
+                        st.markdown(create_animated_metric_card(
+                            "Avg Plies", f"{plies.mean():.0f}", "♟️"
+                        ), unsafe_allow_html=True)
+                    
+                    with col2:
+                        st.markdown(create_animated_metric_card(
+                            "Avg Opening Plies", f"{lengths[:, 0].mean():.0f}", "📖"
+                        ), unsafe_allow_html=True)
+                    
+                    with col3:
+                        st.markdown(create_animated_metric_card(
+                            "Reach Middlegame", f"{(middlegame_ply >= 0).mean() * 100:.1f}%", "⚔️"
+                        ), unsafe_allow_html=True)
+                    
+                    with col4:
+                        st.markdown(create_animated_metric_card(
+                            "Reach Endgame", f"{(endgame_ply >= 0).mean() * 100:.1f}%", "🏁"
+                        ), unsafe_allow_html=True)
+                    
+                    col1, col2 = st.columns(2)
+                    
+                    with col1:
+                        ply_distribution = length_distribution(plies)
+                        render_premium_chart(
+                            'bar', x=ply_distribution.index, y=ply_distribution.values,
+                            title="📊 Game Length Distribution (plies)",
+                            cache_key=chart_scope
+                        )
+                    
+                    with col2:
+                        render_premium_chart(
+                            'heatmap', data=phase_profile(df, phases, 'timecontrol'),
+                            title="🧩 Average Phase Length by Time Control (plies)",
+                            cache_key=chart_scope
+                        )
+                    
+                    if (~replayed).any():
+                        st.caption(
+                            f"{(~replayed).sum():,} non-standard or unreadable games are left out of the phase analysis."
+                        )
+            
+            # Time of Day Analysis
+            if modules["🕐 Time of Day"]:
+                st.markdown("""
+                <div class="analysis-mastercard">
+                    <h2>🕐 TIME OF DAY ANALYSIS</h2>
+                </div>
+                """, unsafe_allow_html=True)
+                
+                activity_counts = build_hour_weekday_counts(dataset_key, df)
+                activity_metric = st.selectbox(
+                    "Heatmap Metric", ['Games', 'White Win %', 'Draw %', 'Black Win %'], key="activity_metric"
+                )
+                render_premium_chart(
+                    'heatmap', data=activity_table(activity_counts, activity_metric),
+                    title=f"🗓️ Weekday × Hour (UTC) - {activity_metric}",
+                    cache_key=(chart_scope, activity_metric)
+                )
+                
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    hourly_games = activity_counts.sum(axis=(0, 2))
+                    render_premium_chart(
+                        'bar', x=[f"{h:02d}:00" for h in range(24)], y=hourly_games,
+                        title="🕐 Games by Hour of Day (UTC)",
+                        cache_key=chart_scope
+                    )
+                
+                with col2:
+                    day_part_games = activity_counts.sum(axis=(0, 2)).reshape(4, 6).sum(axis=1)
+                    render_premium_chart(
+                        'pie', x=DAY_PARTS, y=day_part_games,
+                        title="🌗 Games by Part of Day",
+                        cache_key=chart_scope
                     )
-                    st.plotly_chart(fig_scatter, use_container_width=True)
+            
+            # Session & Tilt Analysis
+            if modules["🔥 Sessions & Tilt"]:
+                st.markdown("""
+                <div class="analysis-mastercard">
+                    <h2>🔥 SESSION & TILT ANALYSIS</h2>
+                </div>
+                """, unsafe_allow_html=True)
+                
+                player_view = build_player_game_view(dataset_key, df)
+                active_players = player_view['players_by_activity'][:50].tolist()
+                time_control_options = crosstab_categories['timecontrol']
+                
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    session_player = st.selectbox(
+                        "Player", ["All Players"] + active_players, index=1 if active_players else 0,
+                        key="session_player"
+                    )
+                with col2:
+                    session_gap = st.slider("Session Gap (minutes)", 5, 180, 30, step=5, key="session_gap")
+                with col3:
+                    tilt_time_control = st.selectbox(
+                        "Tilt Time Control", time_control_options,
+                        index=time_control_options.index('60+0') if '60+0' in time_control_options else 0,
+                        key="tilt_time_control"
+                    )
+                
+                sessions = build_player_sessions(
+                    player_view, session_gap, None if session_player == "All Players" else session_player
+                )
+                
+                if sessions.empty:
+                    st.info("No timestamped games for the selected player.")
+                else:
+                    session_sizes = np.bincount(pd.factorize(sessions['session_id'])[0])
+                    col1, col2, col3, col4 = st.columns(4)
+                    
+                    with col1:
+                        st.markdown(create_animated_metric_card(
+                            "Play Sessions", f"{len(session_sizes):,}", "🎮"
+                        ), unsafe_allow_html=True)
+                    
+                    with col2:
+                        st.markdown(create_animated_metric_card(
+                            "Games / Session", f"{session_sizes.mean():.1f}", "📊"
+                        ), unsafe_allow_html=True)
+                    
+                    with col3:
+                        st.markdown(create_animated_metric_card(
+                            "Longest Session", f"{session_sizes.max()}", "⏱️"
+                        ), unsafe_allow_html=True)
+                    
+                    with col4:
+                        st.markdown(create_animated_metric_card(
+                            "Score Rate", f"{sessions['score'].mean() * 100:.1f}%", "🎯"
+                        ), unsafe_allow_html=True)
+                    
+                    session_scope = (chart_scope, session_player, session_gap)
+                    index_profile = session_index_profile(sessions)
+                    col1, col2 = st.columns(2)
+                    
+                    with col1:
+                        render_premium_chart(
+                            'line', data=index_profile, x='game', y='score_pct',
+                            title="🎯 Score % by Game Number in Session",
+                            cache_key=session_scope
+                        )
+                    
+                    with col2:
+                        render_premium_chart(
+                            'line', data=index_profile, x='game', y='rating_delta',
+                            title="⭐ Rating Change Since Session Start",
+                            cache_key=session_scope
+                        )
+                    
+                    tilt = tilt_profile(sessions, tilt_time_control)
+                    render_premium_chart(
+                        'bar', x=tilt['situation'], y=tilt['score_pct'],
+                        title="🔥 Next-Game Score % After Each Result",
+                        cache_key=(session_scope, tilt_time_control)
+                    )
+                    st.dataframe(tilt, use_container_width=True, hide_index=True)
+            
+            # Source Comparison
+            if modules["🗂️ Source Comparison"]:
+                st.markdown("""
+                <div class="analysis-mastercard">
+                    <h2>🗂️ SOURCE COMPARISON</h2>
+                </div>
+                """, unsafe_allow_html=True)
+                
+                if len(crosstab_categories['source']) < 2:
+                    st.info("Load more than one file to compare sources side by side.")
+                else:
+                    source_summary = df.groupby('source').agg(
+                        games=('source', 'size'),
+                        avg_rating=('avg_elo', 'mean'),
+                        avg_moves=('num_moves', 'mean'),
+                        first_game=('utcdate', 'min'),
+                        last_game=('utcdate', 'max')
+                    ).reset_index()
+                    st.dataframe(
+                        source_summary.style.format({'avg_rating': '{:.0f}', 'avg_moves': '{:.1f}'}),
+                        use_container_width=True, hide_index=True
+                    )
+                    render_export_button(source_summary, "sources", export_format, "export_sources")
+                    
+                    col1, col2 = st.columns(2)
+                    
+                    with col1:
+                        source_outcomes = crosstab_marginal(crosstab, crosstab_categories, ['source', 'winner'])
+                        source_outcome_pct = source_outcomes.div(source_outcomes.sum(axis=1), axis=0) * 100
+                        render_premium_chart(
+                            'heatmap', data=source_outcome_pct.round(1),
+                            title="🎯 Outcome % by Source",
+                            cache_key=chart_scope
+                        )
+                    
+                    with col2:
+                        source_terminations = crosstab_marginal(
+                            crosstab, crosstab_categories, ['source', 'termination']
+                        )
+                        source_termination_pct = source_terminations.div(source_terminations.sum(axis=1), axis=0) * 100
+                        render_premium_chart(
+                            'heatmap', data=source_termination_pct.round(1),
+                            title="🏁 Termination % by Source",
+                            cache_key=chart_scope
+                        )
             
             # Advanced Statistics
             if modules["🔬 Advanced Stats"]:
@@ -788,21 +2273,21 @@ def main():
                 with col1:
                     # Correlation heatmap
                     numeric_cols = ['whiteelo', 'blackelo', 'avg_elo', 'num_moves']
-                    corr_matrix = df[numeric_cols].corr()
-                    fig_corr = create_premium_plotly_chart(
+                    corr_matrix = sql_correlation(dataset_key, df, numeric_cols)
+                    render_premium_chart(
                         'heatmap', data=corr_matrix,
-                        title="🔥 Correlation Matrix - Performance Metrics"
+                        title="🔥 Correlation Matrix - Performance Metrics",
+                        cache_key=chart_scope
                     )
-                    st.plotly_chart(fig_corr, use_container_width=True)
                 
                 with col2:
                     # Event type distribution
-                    event_counts = df['event'].value_counts().head(8)
-                    fig_events = create_premium_plotly_chart(
+                    event_counts = crosstab_marginal(crosstab, crosstab_categories, ['event']).head(8)
+                    render_premium_chart(
                         'pie', x=event_counts.index, y=event_counts.values,
-                        title="🏆 Game Event Type Distribution"
+                        title="🏆 Game Event Type Distribution",
+                        cache_key=chart_scope
                     )
-                    st.plotly_chart(fig_events, use_container_width=True)
                 
                 # Advanced metrics grid
                 st.markdown("### 📊 Performance Metrics Deep Dive")
@@ -832,6 +2317,7 @@ def main():
                 # Detailed statistics table
                 st.markdown("### 📈 Comprehensive Statistics")
                 
+                game_stats = sql_game_statistics(dataset_key, df)
                 stats_data = {
                     'Metric': [
                         'Total Games Played', 'Unique Opponents', 'Average Game Rating',
@@ -840,24 +2326,123 @@ def main():
                         'Most Common Opening', 'Most Common Time Control', 'Peak Performance Rating'
                     ],
                     'Value': [
-                        f"{len(df):,}",
-                        f"{len(set(df['white'].tolist() + df['black'].tolist())):,}",
-                        f"{df['avg_elo'].mean():.1f}",
-                        f"{df['avg_elo'].std():.1f}",
-                        f"{len(df[df['winner'] == 'White']):,}",
-                        f"{len(df[df['winner'] == 'Black']):,}",
-                        f"{len(df[df['winner'] == 'Draw']):,}",
-                        f"{df['num_moves'].min()}",
-                        f"{df['num_moves'].max()}",
-                        f"{df['num_moves'].mean():.1f}",
-                        f"{df['eco'].mode().iloc[0] if len(df['eco'].mode()) > 0 else 'N/A'}",
-                        f"{df['timecontrol'].mode().iloc[0] if len(df['timecontrol'].mode()) > 0 else 'N/A'}",
-                        f"{df['avg_elo'].max():.0f}"
+                        f"{game_stats['total_games']:,}",
+                        f"{game_stats['unique_players']:,}",
+                        f"{game_stats['avg_rating']:.1f}",
+                        f"{game_stats['rating_std']:.1f}",
+                        f"{game_stats['white_wins']:,}",
+                        f"{game_stats['black_wins']:,}",
+                        f"{game_stats['draws']:,}",
+                        f"{game_stats['shortest_game']}",
+                        f"{game_stats['longest_game']}",
+                        f"{game_stats['avg_moves']:.1f}",
+                        f"{game_stats['eco_mode']}",
+                        f"{game_stats['timecontrol_mode']}",
+                        f"{game_stats['peak_rating']:.0f}"
                     ]
                 }
                 
                 stats_df = pd.DataFrame(stats_data)
                 st.dataframe(stats_df, use_container_width=True, hide_index=True)
+                render_export_button(stats_df, "statistics", export_format, "export_stats")
+            
+            # SQL Explorer
+            if modules["🧮 SQL Explorer"]:
+                st.markdown("""
+                <div class="analysis-mastercard">
+                    <h2>🧮 SQL EXPLORER</h2>
+                </div>
+                """, unsafe_allow_html=True)
+                
+                st.caption("Query the processed games as the `games` table with DuckDB SQL.")
+                sql_text = st.text_area("SQL Query", SQL_DEFAULT_QUERY, height=160, key="sql_query")
+                if sql_text.strip():
+                    import duckdb
+                    
+                    try:
+                        sql_result = run_games_query(dataset_key, df, sql_text)
+                    except duckdb.Error as e:
+                        st.error(f"❌ Query failed: {str(e)}")
+                    else:
+                        st.markdown(f"**{len(sql_result):,} rows**")
+                        st.dataframe(sql_result, use_container_width=True, hide_index=True)
+                        render_export_button(sql_result, "query_result", export_format, "export_sql")
+            
+            # Engine Accuracy Analysis
+            if modules["♞ Engine Analysis"]:
+                st.markdown("""
+                <div class="analysis-mastercard">
+                    <h2>♞ ENGINE ACCURACY ANALYSIS</h2>
+                </div>
+                """, unsafe_allow_html=True)
+                
+                col1, col2, col3, col4 = st.columns(4)
+                
+                with col1:
+                    st.markdown(create_animated_metric_card(
+                        "White Avg CP Loss", f"{df['white_acpl'].mean():.0f}", "🤍"
+                    ), unsafe_allow_html=True)
+                
+                with col2:
+                    st.markdown(create_animated_metric_card(
+                        "Black Avg CP Loss", f"{df['black_acpl'].mean():.0f}", "⚫"
+                    ), unsafe_allow_html=True)
+                
+                with col3:
+                    st.markdown(create_animated_metric_card(
+                        "Total Blunders", f"{int(df['white_blunders'].sum() + df['black_blunders'].sum()):,}", "💥"
+                    ), unsafe_allow_html=True)
+                
+                with col4:
+                    analyzed = df['white_blunders'].notna()
+                    blunder_free = (
+                        (df['white_blunders'] == 0) & (df['black_blunders'] == 0)
+                    )[analyzed].mean() * 100
+                    st.markdown(create_animated_metric_card(
+                        "Blunder-Free Games", f"{blunder_free:.1f}%", "✨"
+                    ), unsafe_allow_html=True)
+                
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    acpl_df = pd.DataFrame({
+                        'acpl': pd.concat([df['white_acpl'], df['black_acpl']], ignore_index=True)
+                    })
+                    render_premium_chart(
+                        'histogram', data=acpl_df, x='acpl',
+                        title="🎯 Average Centipawn Loss Distribution",
+                        cache_key=chart_scope
+                    )
+                
+                with col2:
+                    blunders_by_outcome = df.groupby('winner')[['white_blunders', 'black_blunders']].mean()
+                    render_premium_chart(
+                        'heatmap', data=blunders_by_outcome.round(2),
+                        title="💥 Average Blunders by Game Outcome",
+                        cache_key=chart_scope
+                    )
+                
+                if (~analyzed).any():
+                    st.caption(
+                        f"{(~analyzed).sum():,} non-standard or unreadable games are left out of the engine analysis."
+                    )
+            
+            # Diagnostics
+            with st.sidebar:
+                with st.expander("🩺 Diagnostics"):
+                    figure_cache = get_figure_cache()
+                    lookups = figure_cache['hits'] + figure_cache['misses']
+                    hit_rate = figure_cache['hits'] / lookups * 100 if lookups else 0
+                    st.markdown("**Figure Cache**")
+                    st.text(
+                        f"Hits: {figure_cache['hits']:,}\n"
+                        f"Misses: {figure_cache['misses']:,}\n"
+                        f"Hit Rate: {hit_rate:.1f}%\n"
+                        f"Entries: {len(figure_cache['figures']):,}\n"
+                        f"Size: {figure_cache['bytes'] / 1024 / 1024:.1f} MB / "
+                        f"{FIGURE_CACHE_MAX_BYTES / 1024 / 1024:.0f} MB\n"
+                        f"Evictions: {figure_cache['evictions']:,}"
+                    )
     
     else:
         # Premium Welcome Screen
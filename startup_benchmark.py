@@ -0,0 +1,51 @@
+"""Cold-start benchmark for the Streamlit dashboard.
+
+Imports main.py in fresh interpreters and exits non-zero when the median
+import time goes over the startup budget.
+
+    python startup_benchmark.py [--budget SECONDS] [--runs N]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+STARTUP_BUDGET_SECONDS = 1.5
+DEFAULT_RUNS = 5
+
+IMPORT_TIMER = (
+    "import time; start = time.perf_counter(); import main; "
+    "print(time.perf_counter() - start)"
+)
+
+def measure_cold_import():
+    """Import main.py in a new interpreter and return the import time in seconds"""
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_TIMER],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure dashboard cold-start import time")
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET_SECONDS)
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    args = parser.parse_args()
+
+    timings = [measure_cold_import() for _ in range(args.runs)]
+    median = statistics.median(timings)
+    print(f"Cold import of main.py: median {median:.3f}s, "
+          f"min {min(timings):.3f}s, max {max(timings):.3f}s over {args.runs} runs")
+
+    if median > args.budget:
+        print(f"❌ Over the {args.budget:.2f}s startup budget")
+        return 1
+    print(f"✅ Within the {args.budget:.2f}s startup budget")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
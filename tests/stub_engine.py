@@ -0,0 +1,62 @@
+"""Minimal UCI engine for tests.
+
+Scores come from a JSON file mapping "<board fen> <side to move>" to White centipawns
+(STUB_ENGINE_SCORES, default 0). Every search is appended to STUB_ENGINE_LOG, and the
+process exits without answering once it has served STUB_ENGINE_CRASH_AFTER searches.
+"""
+import json
+import os
+import sys
+
+import chess
+
+def position_key(board):
+    """Key a position the way the tests build their score tables"""
+    return f"{board.board_fen()} {'w' if board.turn == chess.WHITE else 'b'}"
+
+def parse_position(tokens):
+    """Build the board described by the arguments of a UCI position command"""
+    if tokens[0] == 'startpos':
+        board, rest = chess.Board(), tokens[1:]
+    else:
+        board, rest = chess.Board(' '.join(tokens[1:7])), tokens[7:]
+    if rest and rest[0] == 'moves':
+        for move in rest[1:]:
+            board.push_uci(move)
+    return board
+
+def main():
+    scores_path = os.environ.get('STUB_ENGINE_SCORES')
+    scores = json.load(open(scores_path)) if scores_path else {}
+    log_path = os.environ.get('STUB_ENGINE_LOG')
+    crash_after = int(os.environ.get('STUB_ENGINE_CRASH_AFTER', '0'))
+    searches = 0
+    board = chess.Board()
+
+    for line in iter(sys.stdin.readline, ''):
+        tokens = line.split()
+        if not tokens:
+            continue
+        if tokens[0] == 'uci':
+            print('id name Stub\nuciok', flush=True)
+        elif tokens[0] == 'isready':
+            print('readyok', flush=True)
+        elif tokens[0] == 'position':
+            board = parse_position(tokens[1:])
+        elif tokens[0] == 'go':
+            searches += 1
+            if crash_after and searches > crash_after:
+                sys.exit(1)
+            key = position_key(board)
+            if log_path:
+                with open(log_path, 'a') as log:
+                    log.write(key + '\n')
+            # UCI scores are from the side to move
+            white_cp = scores.get(key, 0)
+            cp = white_cp if board.turn == chess.WHITE else -white_cp
+            print(f'info depth 1 score cp {cp} nodes 1\nbestmove (none)', flush=True)
+        elif tokens[0] == 'quit':
+            break
+
+if __name__ == '__main__':
+    main()
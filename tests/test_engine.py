@@ -0,0 +1,87 @@
+"""Engine pipeline tests against the stub UCI engine in tests/stub_engine.py"""
+import json
+import os
+import sqlite3
+import sys
+
+import chess.engine
+import numpy as np
+import pandas as pd
+import pytest
+
+import main
+
+STUB_ENGINE = [sys.executable, os.path.join(os.path.dirname(__file__), 'stub_engine.py')]
+
+# Scholar's mate: the final position is checkmate and is scored without the engine
+SCHOLARS_MATE = '1. e4 e5 2. Qh5 Nc6 3. Bc4 Nf6 4. Qxf7# 1-0'
+# White centipawns for the positions before the mate, one per ply starting from the initial position
+SCHOLARS_MATE_SCORES = [0, -350, -230, -220, -250, -300, 100]
+
+def position_key(board):
+    return f"{board.board_fen()} {'w' if board.turn == chess.WHITE else 'b'}"
+
+@pytest.fixture
+def stub_engine(tmp_path, monkeypatch):
+    """Point the stub at a score table and a search log, returning the log path"""
+    boards = main.replay_positions(SCHOLARS_MATE)
+    scores = {position_key(board): cp for board, cp in zip(boards, SCHOLARS_MATE_SCORES)}
+    scores_path = tmp_path / 'scores.json'
+    scores_path.write_text(json.dumps(scores))
+    log_path = tmp_path / 'searches.log'
+    monkeypatch.setenv('STUB_ENGINE_SCORES', str(scores_path))
+    monkeypatch.setenv('STUB_ENGINE_LOG', str(log_path))
+    main.analyze_games_with_engine.clear()
+    yield log_path
+    main.analyze_games_with_engine.clear()
+
+def searches(log_path):
+    return log_path.read_text().splitlines() if log_path.exists() else []
+
+def games(*moves, variants=None):
+    return pd.DataFrame({'moves': list(moves), 'variant': variants or ['Standard'] * len(moves)})
+
+def test_centipawn_loss_and_blunders(stub_engine, tmp_path):
+    metrics = main.analyze_games_with_engine(
+        games(SCHOLARS_MATE), STUB_ENGINE, workers=2, depth=1, cache_path=str(tmp_path / 'cache.sqlite')
+    )
+    # White losses per move: 350, 0, 50, 0 (the mate swings to +1000); Black: 120, 0, 400
+    assert metrics.loc[0, 'white_acpl'] == pytest.approx(100.0)
+    assert metrics.loc[0, 'black_acpl'] == pytest.approx(520 / 3)
+    assert metrics.loc[0, 'white_blunders'] == 1
+    assert metrics.loc[0, 'black_blunders'] == 1
+    # The mating position never reaches the engine
+    assert len(searches(stub_engine)) == len(SCHOLARS_MATE_SCORES)
+
+def test_second_run_is_served_from_the_cache(stub_engine, tmp_path):
+    cache_path = str(tmp_path / 'cache.sqlite')
+    first = main.analyze_games_with_engine(games(SCHOLARS_MATE), STUB_ENGINE, 2, 1, cache_path=cache_path)
+    searched = len(searches(stub_engine))
+
+    main.analyze_games_with_engine.clear()
+    second = main.analyze_games_with_engine(games(SCHOLARS_MATE), STUB_ENGINE, 2, 1, cache_path=cache_path)
+
+    assert len(searches(stub_engine)) == searched
+    pd.testing.assert_frame_equal(first, second)
+
+def test_worker_crash_saves_partial_results(stub_engine, tmp_path, monkeypatch):
+    monkeypatch.setenv('STUB_ENGINE_CRASH_AFTER', '2')
+    cache_path = str(tmp_path / 'cache.sqlite')
+
+    with pytest.raises(chess.engine.EngineError):
+        main.analyze_games_with_engine(games(SCHOLARS_MATE), STUB_ENGINE, 1, 1, cache_path=cache_path)
+
+    with sqlite3.connect(cache_path) as conn:
+        saved = conn.execute("SELECT count(*) FROM evaluations").fetchone()[0]
+    assert saved == 2
+
+def test_unreplayable_games_get_nan(stub_engine, tmp_path):
+    df = games(
+        SCHOLARS_MATE, SCHOLARS_MATE, '1. e4 e5 2. Qxz9 Nc6 1-0',
+        variants=['Standard', 'Chess960', 'Standard']
+    )
+    metrics = main.analyze_games_with_engine(df, STUB_ENGINE, 2, 1, cache_path=str(tmp_path / 'cache.sqlite'))
+
+    assert metrics.loc[0].notna().all()
+    assert metrics.loc[[1, 2]].isna().all().all()
+    assert np.array_equal(metrics.index, df.index)
@@ -0,0 +1,32 @@
+"""Loader tests: a bad file is quarantined on its own instead of failing the whole upload"""
+import os
+
+import main
+
+GAMES_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'games.csv')
+
+def load(*sources):
+    main.load_and_process_data.clear()
+    return main.load_and_process_data([(name, path, 0) for name, path in sources])
+
+def test_unreadable_files_are_quarantined_alongside_good_ones(tmp_path):
+    empty = tmp_path / 'empty.csv'
+    empty.write_bytes(b'')
+    expected, _ = load(('games.csv', GAMES_CSV))
+
+    df, quarantine = load(
+        ('empty.csv', str(empty)), ('missing.csv', str(tmp_path / 'missing.csv')), ('games.csv', GAMES_CSV)
+    )
+
+    assert len(df) == len(expected)
+    unreadable = quarantine[quarantine['quarantine_reason'].str.startswith('Unreadable file')]
+    assert sorted(unreadable['source']) == ['empty.csv', 'missing.csv']
+
+def test_only_unreadable_files_give_an_empty_frame(tmp_path):
+    empty = tmp_path / 'empty.csv'
+    empty.write_bytes(b'')
+
+    df, quarantine = load(('empty.csv', str(empty)))
+
+    assert df.empty
+    assert quarantine['source'].tolist() == ['empty.csv']
@@ -0,0 +1,55 @@
+"""SQL helpers checked against the pandas computations they replaced, on the bundled games.csv"""
+import os
+
+import pandas as pd
+import pytest
+
+import main
+
+GAMES_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'games.csv')
+DATASET_KEY = (('games.csv', 0),)
+
+@pytest.fixture(scope='module')
+def games():
+    df, _ = main.load_and_process_data([('games.csv', GAMES_CSV, 0)])
+    yield df
+    main.open_games_database.clear()
+
+@pytest.mark.parametrize('column', ['eco', 'white', 'black'])
+def test_value_counts(games, column):
+    expected = games[column].value_counts()
+    result = main.sql_value_counts(DATASET_KEY, games, column)
+
+    assert result.index.tolist() == expected.index.tolist()
+    assert result.tolist() == expected.tolist()
+    assert main.sql_value_counts(DATASET_KEY, games, column, 10).index.tolist() == expected.index[:10].tolist()
+
+def test_monthly_games(games):
+    expected = games.groupby('month').size()
+    result = main.sql_monthly_games(DATASET_KEY, games)
+
+    assert result['month'].astype(str).tolist() == expected.index.astype(str).tolist()
+    assert result['games'].tolist() == expected.tolist()
+
+def test_correlation(games):
+    columns = ['whiteelo', 'blackelo', 'avg_elo', 'num_moves']
+    result = main.sql_correlation(DATASET_KEY, games, columns)
+
+    pd.testing.assert_frame_equal(result, games[columns].corr(), check_exact=False, rtol=1e-9)
+
+def test_game_statistics(games):
+    stats = main.sql_game_statistics(DATASET_KEY, games)
+
+    assert stats['total_games'] == len(games)
+    assert stats['unique_players'] == len(set(games['white'].tolist() + games['black'].tolist()))
+    assert stats['avg_rating'] == pytest.approx(games['avg_elo'].mean())
+    assert stats['rating_std'] == pytest.approx(games['avg_elo'].std())
+    assert stats['peak_rating'] == pytest.approx(games['avg_elo'].max())
+    assert stats['white_wins'] == (games['winner'] == 'White').sum()
+    assert stats['black_wins'] == (games['winner'] == 'Black').sum()
+    assert stats['draws'] == (games['winner'] == 'Draw').sum()
+    assert stats['shortest_game'] == games['num_moves'].min()
+    assert stats['longest_game'] == games['num_moves'].max()
+    assert stats['avg_moves'] == pytest.approx(games['num_moves'].mean())
+    assert stats['eco_mode'] == games['eco'].mode().iloc[0]
+    assert stats['timecontrol_mode'] == games['timecontrol'].mode().iloc[0]